@@ -1,3 +1,8 @@
+import functools
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Tuple, List, Union
+
 import src.calculatorLogic.expression_formatter as expression_formatter
 import src.calculatorLogic.solver as solver
 import src.userInteraction.user_interaction_handler as user_interaction_handler
@@ -7,6 +12,9 @@ from src.calculatorLogic.calc_errors import FormattingError, CalculationError, S
 EXIT_INPUT = "quit"
 HELP_INPUT = "help"
 
+EXPR_CACHE_SIZE = 128  # The max amount of solved expressions remembered by the calculator
+FORMAT_CACHE_SIZE = 256  # The max amount of tokenized and formatted expressions remembered by the calculator
+
 
 class Calculator:
     def __init__(self):
@@ -15,87 +23,145 @@ class Calculator:
         """
         self.defined_operators = defined_operators.OmegaDefinedOperators()
 
+        # the defined operators do not change, so the list of operations shown by 'help' is built once
+        self._operations_help_text = ", ".join(
+            s + (op.get_end_symbol() if isinstance(op, operator.ContainerOperator) else "")
+            for (s, op) in self.defined_operators.get_operators_dict().items())
+
         self.user_interaction_handler = user_interaction_handler.ConsoleInteractionHandler()
         self.formatter = expression_formatter.InfixToPostfixFormatter(self.defined_operators)
         self.solver = solver.PostfixSolver()
 
+        # maps raw user input to the displayed result (least recently used first)
+        self._expr_cache: OrderedDict[str, str] = OrderedDict()
+
+        # tokenizing and formatting only depend on their input, so their results can be reused.
+        # failed calls raise and are not stored. the cached lists are shared and must not be modified.
+        self._extract_symbols = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self.formatter.extract_symbols)
+        self._compile_symbols = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self._compile_symbol_tuple)
+
+        # bound methods used for every expression, bound once to save the attribute lookups
+        self._execute = self.solver.execute
+        self._display = self.user_interaction_handler.display
+
+    def _compile_symbol_tuple(self, symbols: Tuple[str, ...]) -> List[float]:
+        """
+        Format and compile an expression given as a tuple of symbols (so it can be used as a cache key).
+        :param symbols: The symbols of the expression.
+        :return: The compiled expression (the operands left after calculating it), ready to be executed by
+            the solver.
+        """
+        return self.solver.compile(self.formatter.format_expression(list(symbols)))
+
     def calculate(self, expression: str) -> float:
         """
         Get a mathematical expression as a string solve it and return the answer.
         :param expression: Mathematical expression as a string.
         :return: The result of the expression.
         """
-        symbol_list = self.formatter.extract_symbols(expression)
+        symbol_list = self._extract_symbols(expression)
 
-        formatted_expression = self.formatter.format_expression(symbol_list)
+        compiled_expression = self._compile_symbols(tuple(symbol_list))
 
-        return self.solver.solve(formatted_expression)
+        return self._execute(compiled_expression)
+
+    def _try_solve_symbols(self, symbol_list: List[str]) -> Tuple[bool, Union[float, str], int]:
+        """
+        Format and solve an expression that was already split to symbols. Unlike calculate(), invalid
+        expressions are reported in the returned value instead of raising an exception.
+        :param symbol_list: The symbols of the expression.
+        :return: A tuple of 3 values. If the expression was solved: ``True``, the result and -1.
+            Otherwise: ``False``, the error message and the position of the error in the symbol list
+            (-1 if the error is not tied to a position).
+        """
+        try:
+            compiled_expression = self._compile_symbols(tuple(symbol_list))
+
+            return True, self._execute(compiled_expression), -1
+        except FormattingError as e:
+            return False, e.message, e.position
+        except (CalculationError, SolvingError) as e:
+            return False, e.message, -1
 
     def display_help(self) -> None:
         """
         Display the help text that gives info about the calculator and available operators and commands.
         """
-        self.user_interaction_handler.display("Type a mathematical expression to get a solution. "
-                                              "The possible operations are: ")
+        self._display("Type a mathematical expression to get a solution. "
+                      "The possible operations are: ")
 
-        self.user_interaction_handler.display(", ".join(
-            [s if not isinstance(op, operator.ContainerOperator) else s + op.get_end_symbol()
-             for (s, op) in self.defined_operators.get_operators_dict().items()]), end="\n\n")
+        self._display(self._operations_help_text, end="\n\n")
 
-        self.user_interaction_handler.display("Additional commands: \n"
-                                              f"{HELP_INPUT} - show this information.\n"
-                                              f"{EXIT_INPUT} - exit the program.\n")
+        self._display("Additional commands: \n"
+                      f"{HELP_INPUT} - show this information.\n"
+                      f"{EXIT_INPUT} - exit the program.\n")
 
     def run(self):
         """
         Run the Calculator.
         """
-        self.user_interaction_handler.display(f"Enter expressions to evaluate "
-                                              f"(enter '{EXIT_INPUT}' to exit the program): ")
+        # bound once, the loop below runs for the whole session
+        display = self._display
+        get_input_or_exit = self.user_interaction_handler.get_input_or_exit
+
+        display(f"Enter expressions to evaluate "
+                f"(enter '{EXIT_INPUT}' to exit the program): ")
 
-        continue_running, user_input = self.user_interaction_handler.get_input_or_exit(EXIT_INPUT, ">>> ")
+        continue_running, user_input = get_input_or_exit(EXIT_INPUT, ">>> ")
 
         while continue_running:
-            symbol_list = self.formatter.extract_symbols(user_input)
+            cached_result = self._expr_cache.get(user_input)
+
+            if cached_result is not None:
+                # the same expression was already solved, no need to solve it again
+                self._expr_cache.move_to_end(user_input)
+                display(cached_result)
+
+                continue_running, user_input = get_input_or_exit(EXIT_INPUT, ">>> ")
+                continue
+
+            symbol_list = self._extract_symbols(user_input)
             # print(symbol_list)
 
-            if len(symbol_list) > 0 and symbol_list[0] == HELP_INPUT:
+            if not symbol_list:
+                pass  # empty input, nothing to solve
+            elif symbol_list[0] == HELP_INPUT:
                 self.display_help()
             else:
                 try:
-                    formatted_expression = self.formatter.format_expression(symbol_list)
-                    # print([str(item) for item in formatted_expression])
-
-                    result = self.solver.solve(formatted_expression)
-
-                    self.user_interaction_handler.display(f"= {result}\n")
-                except FormattingError as e:
-                    self.user_interaction_handler.display(e.message)
-
-                    if e.position >= 0:
+                    solved, result, error_position = self._try_solve_symbols(symbol_list)
+                except Exception as e:
+                    solved, result, error_position = False, str(e), -1
+
+                if solved:
+                    result_str = f"= {result}\n"
+                    display(result_str)
+
+                    # only successful results are cached, errors are always computed again
+                    self._expr_cache[user_input] = result_str
+                    if len(self._expr_cache) > EXPR_CACHE_SIZE:
+                        self._expr_cache.popitem(last=False)
+                elif error_position >= 0:
+                    # the error is printed in several parts, output them in a single write
+                    with self.user_interaction_handler.batched():
+                        display(result)
+
+                        # the symbols are shown joined (not the raw input) so the marker lines up with them
                         position_msg_prefix = "At position: "
-                        self.user_interaction_handler.display(position_msg_prefix, "")
+                        display(position_msg_prefix + "".join(symbol_list))
 
-                        self.user_interaction_handler.display("".join(symbol_list))
+                        # the column where each symbol starts, so the marker is padded in a single write
+                        offsets = [0, *accumulate(len(symbol) for symbol in symbol_list)]
+                        display(" " * (len(position_msg_prefix) + offsets[min(error_position, len(symbol_list))]), "")
 
-                        for i in range(min(e.position, len(symbol_list))):
-                            self.user_interaction_handler.display(" " * len(symbol_list[i]), "")
-                        self.user_interaction_handler.display(" " * len(position_msg_prefix), "")
-
-                        if e.position < len(symbol_list):
-                            self.user_interaction_handler.display("^" * len(symbol_list[e.position]))
+                        if error_position < len(symbol_list):
+                            display("^" * len(symbol_list[error_position]))
                         else:
-                            self.user_interaction_handler.display("^")
-                    else:
-                        self.user_interaction_handler.display("")
-                except CalculationError as e:
-                    self.user_interaction_handler.display(e.message, end="\n\n")
-                except SolvingError as e:
-                    self.user_interaction_handler.display(e.message, end="\n\n")
-                except Exception as e:
-                    self.user_interaction_handler.display(str(e), end="\n\n")
+                            display("^")
+                else:
+                    display(result, end="\n\n")
 
             # get next input from the user
-            continue_running, user_input = self.user_interaction_handler.get_input_or_exit(EXIT_INPUT, ">>> ")
+            continue_running, user_input = get_input_or_exit(EXIT_INPUT, ">>> ")
 
-        self.user_interaction_handler.display("Exiting program...")
+        display("Exiting program...")
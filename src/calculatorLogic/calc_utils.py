@@ -1,15 +1,19 @@
-def delete_whitespace(expression: str) -> str:
-    return "".join(expression.split())
+import functools
+import re
+
+# digits with at most one decimal point, and at least one digit. \d matches any unicode decimal digit, which
+# float() can parse (unlike other digit-like characters such as '²')
+_FLOAT_RE = re.compile(r"\d+\.?\d*|\.\d+")
+
+FLOAT_STR_CACHE_SIZE = 1024  # The max amount of symbols remembered by is_float_str
 
 
 def organize_whitespace(expression: str) -> str:
     return " ".join(expression.split())
 
 
+@functools.lru_cache(maxsize=FLOAT_STR_CACHE_SIZE)
 def is_float_str(value: str) -> bool:
-    # Handling the case for one decimal point
-    value = delete_whitespace(value)
-    cleaned_value = value.replace(".", "", 1)
-
-    # Check if the cleaned string consists only of digits
-    return cleaned_value.isdigit()
+    # Symbols are never padded with whitespace, so no cleaning is needed.
+    # The whole check runs in the regex engine, and the same symbols repeat a lot, so the results are cached
+    return _FLOAT_RE.fullmatch(value) is not None
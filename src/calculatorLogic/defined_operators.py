@@ -1,16 +1,27 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+import sys
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Dict, Any, List, ClassVar, Optional, Callable, FrozenSet, Mapping
 
 from src.calculatorLogic import operator
 
 
-class Operator(ABC):
+class Operator:
     """
     An abstract operator.
     """
+    __slots__ = ()  # operators have no per-instance state, their attributes are defined by their classes
+
     _priority: float
     _symbol: str
 
+    # ``True`` only for ContainerOperators. A plain attribute so hot loops can classify an operator without isinstance()
+    is_container: ClassVar[bool] = False
+
+    # ``True`` only for UnaryOperators with their operand before them (like factorial). Set automatically from
+    # the operand position of each UnaryOperator subclass
+    is_unary_before: ClassVar[bool] = False
+
     def get_priority(self) -> float:
         """
         Get the priority of the operator in the order of operations.
@@ -30,38 +41,51 @@ class Operator(ABC):
         return self._symbol
 
 
-class IDefinedOperators(ABC):
+class OperatorCategory(IntEnum):
+    """
+    The category of the symbol that comes before an overloaded operator in an expression.
+    The correct overload of an operator is decided by this category.
+    """
+    NONE = 0  # no symbol before the operator (start of the expression)
+    VALUE = 1  # a symbol that is not an operator (a number or the end of a container)
+    CONTAINER = 2
+    BINARY = 3
+    UNARY_AFTER = 4  # unary operator that comes before its operand (operand is after it)
+    UNARY_BEFORE = 5  # unary operator that comes after its operand (operand is before it)
+    UNARY_MINUS = 6
+    OTHER = 7
+
+
+class IDefinedOperators:
     """
     A class that implements this interface will provide the operators for the calculator.
     """
 
-    @abstractmethod
-    def get_operators_dict(self) -> Dict[str, Any]:
+    def get_operators_dict(self) -> Mapping[str, Any]:
         """
         Get a dictionary of all the defined operators. The keys of the dictionary are
         the symbols of the Operators stored as the values. Sometimes a list will be stored as
         the value of a key and when this happens, resolve_overloads() function should be called.
-        :return: The dictionary containing the pairs of strings and Operators
+        :return: A read-only dictionary containing the pairs of strings and Operators (can be kept
+            and shared without copying it). Only the dictionary itself is read-only, the lists of
+            overloaded operators in it belong to the defined operators and must not be modified.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_symbols(self):
         """
         Get all the symbols of the operators
         :return: A collection containing the symbols of all the operators.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_end_symbols(self):
         """
         Get all the end symbols of the ContainerOperators.
         :return: A collection containing the end symbols of the operators
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def is_operator(self, expression: List[str], position: int) -> bool:
         """
         Returns ``True`` if the symbol at the given position is an operator and ``False`` otherwise.
@@ -69,47 +93,73 @@ class IDefinedOperators(ABC):
         :param position: The index of the symbol at the list representing the expression.
         :return: A boolean value.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
-    def get_operator(self, expression: List[str], position: int) -> Operator:
+    def get_operator(self, expression: List[str], position: int,
+                     op_cache: Optional[List[Optional[Operator]]] = None) -> Operator:
         """
         Returns the operator at that position of the expression.
         :param expression: The expression of string symbols.
         :param position: The index of the operator at the list representing the expression.
+        :param op_cache: Optional list (the same length as the expression) of the operators already resolved in
+            this expression, ``None`` where not resolved yet. Resolved operators are stored in it.
         :return: The correct operator for this position.
         :raises ValueError: If the item at the given position is not an operator
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
-    def resolve_overloads(self, expression: List[str], position: int) -> Operator:
+    def resolve_overloads(self, expression: List[str], position: int,
+                          op_cache: Optional[List[Optional[Operator]]] = None) -> Operator:
         """
         Given a position with an overloaded operator, this function decides and returns the correct operator at this
         position in the expression. This function resolves all overloaded operators at this DefinedOperators.
         (ContainerOperators should not be overloaded!!!)
         :param expression: The expression of string symbols.
         :param position: The index of the overloaded operator at the list representing the expression.
+        :param op_cache: Optional cache of the operators already resolved in this expression (see get_operator).
         :return: The correct operator for this position.
         """
-        pass
+        raise NotImplementedError
 
 
-class BaseDefinedOperators(IDefinedOperators, ABC):
+class BaseDefinedOperators(IDefinedOperators):
     """
     Subclasses of this class define the operators for the calculator. All the operations that can be performed by
     the calculator are defined in an instance of a subclass of this class.
     """
     _op_dict: Dict[str, Any] = {}
 
-    def get_operators_dict(self) -> Dict[str, Any]:
-        return self._op_dict
+    # lookups built from _op_dict, must be updated with _update_lookups() when it changes.
+    # _single_ops and _overloaded_ops split _op_dict by the type of its values, so getting an operator
+    # needs no type checks
+    _symbols_set: FrozenSet[str] = frozenset()
+    _end_symbols_set: FrozenSet[str] = frozenset()
+    _single_ops: Dict[str, Operator] = {}
+    _overloaded_ops: Dict[str, List[Operator]] = {}
+    _op_view: Mapping[str, Any] = MappingProxyType({})  # read-only view of _op_dict (its overload lists are not)
 
-    def get_symbols(self):
-        return self._op_dict.keys()
+    def get_operators_dict(self) -> Mapping[str, Any]:
+        return self._op_view
 
-    def get_end_symbols(self):
-        return [op.get_end_symbol() for op in self._op_dict.values() if isinstance(op, operator.ContainerOperator)]
+    def get_symbols(self) -> FrozenSet[str]:
+        return self._symbols_set
+
+    def get_end_symbols(self) -> FrozenSet[str]:
+        return self._end_symbols_set
+
+    def _update_lookups(self) -> None:
+        """
+        Rebuild the cached symbol sets returned by get_symbols() and get_end_symbols() and the dictionaries of
+        single and overloaded operators from the operators dictionary. Should be called every time the
+        dictionary changes.
+        """
+        self._single_ops = {s: op for (s, op) in self._op_dict.items() if not isinstance(op, list)}
+        self._overloaded_ops = {s: ops for (s, ops) in self._op_dict.items() if isinstance(ops, list)}
+
+        self._op_view = MappingProxyType(self._op_dict)
+        self._symbols_set = frozenset(self._op_dict)
+        self._end_symbols_set = frozenset(op.get_end_symbol() for op in self._op_dict.values()
+                                          if isinstance(op, operator.ContainerOperator))
 
     def _add_op(self, op: Operator) -> None:
         """
@@ -117,14 +167,19 @@ class BaseDefinedOperators(IDefinedOperators, ABC):
         intended to be used by subclasses of BaseDefinedOperators.
         :param op: The operator to add to the dictionary
         """
-        if op.get_symbol() in self._op_dict.keys():  # if overloaded operator, add to a list
-            if not isinstance(self._op_dict[op.get_symbol()], list):  # if list still does not exist, create it
-                temp = self._op_dict[op.get_symbol()]
-                self._op_dict[op.get_symbol()] = [temp]
+        # interned like the symbols extracted from expressions, so looking them up compares identities first
+        symbol = sys.intern(op.get_symbol())
+
+        if symbol in self._op_dict:  # if overloaded operator, add to a list
+            if not isinstance(self._op_dict[symbol], list):  # if list still does not exist, create it
+                temp = self._op_dict[symbol]
+                self._op_dict[symbol] = [temp]
 
-            self._op_dict[op.get_symbol()].append(op)
+            self._op_dict[symbol].append(op)
         else:
-            self._op_dict[op.get_symbol()] = op
+            self._op_dict[symbol] = op
+
+        self._update_lookups()
 
     def _get_overloaded_by_class(self, op_symbol: str, op_type: type) -> Operator:
         """
@@ -133,22 +188,30 @@ class BaseDefinedOperators(IDefinedOperators, ABC):
         :param op_type: The type of the operator to get.
         :return: The desired operator from this entry in the dict.
         """
-        return next((op for op in self._op_dict[op_symbol] if isinstance(op, op_type)),
-                    self._op_dict[op_symbol][0])
+        return next((op for op in self._overloaded_ops[op_symbol] if isinstance(op, op_type)),
+                    self._overloaded_ops[op_symbol][0])
 
     def is_operator(self, expression: List[str], position: int) -> bool:
-        return expression[position] in self._op_dict.keys()
+        return expression[position] in self._symbols_set
+
+    def get_operator(self, expression: List[str], position: int,
+                     op_cache: Optional[List[Optional[Operator]]] = None) -> Operator:
+        if op_cache is not None and op_cache[position] is not None:
+            return op_cache[position]
 
-    def get_operator(self, expression: List[str], position: int) -> Operator:
         op_symbol = expression[position]
+        op = self._single_ops.get(op_symbol)
 
-        if not op_symbol in self._op_dict.keys():
-            raise ValueError("Symbol at given position is not an operator!")
+        if op is None:
+            if op_symbol not in self._overloaded_ops:
+                raise ValueError("Symbol at given position is not an operator!")
 
-        if isinstance(self._op_dict[op_symbol], list):
-            return self.resolve_overloads(expression, position)
-        else:
-            return self._op_dict[op_symbol]
+            op = self.resolve_overloads(expression, position, op_cache)
+
+        if op_cache is not None:
+            op_cache[position] = op
+
+        return op
 
 
 class OmegaDefinedOperators(BaseDefinedOperators):
@@ -157,7 +220,57 @@ class OmegaDefinedOperators(BaseDefinedOperators):
     are provided by an instance of this class.
     """
 
+    # The operators dictionary built by the first instance of each class (a subclass may define different
+    # operators, so every class keeps its own). The operators do not hold any per-instance state, so later
+    # instances only need a copy of the dictionary and of its overload lists.
+    _PROTOTYPE_DICT: ClassVar[Optional[Dict[str, Any]]] = None
+
     def __init__(self):
+        cls = type(self)
+        if cls.__dict__.get("_PROTOTYPE_DICT") is None:  # only the own dictionary of the class, not a parent's
+            cls._PROTOTYPE_DICT = self._build_op_dict()
+
+        self._op_dict = {symbol: (list(op_entry) if isinstance(op_entry, list) else op_entry)
+                         for (symbol, op_entry) in cls._PROTOTYPE_DICT.items()}
+        self._update_lookups()
+
+        # the category of each type of operator, so categorizing needs no isinstance checks
+        self._cat_of_type: Dict[type, OperatorCategory] = {}
+        for op_entry in self._op_dict.values():
+            for op in (op_entry if isinstance(op_entry, list) else [op_entry]):
+                self._cat_of_type[type(op)] = self._categorize(op)
+
+        # the overload of '-' that should be used after each category of symbol
+        minus_overloads = {
+            OperatorCategory.NONE: operator.Minus,  # if the first symbol, must be unary minus
+            OperatorCategory.VALUE: operator.Subtraction,
+            OperatorCategory.CONTAINER: operator.Minus,  # if start of an independent expression
+            OperatorCategory.UNARY_MINUS: operator.Minus,  # if the previous operator is unary minus
+            OperatorCategory.BINARY: operator.NegativeSign,  # if after an operator that requires a value
+            OperatorCategory.UNARY_AFTER: operator.NegativeSign,
+            OperatorCategory.UNARY_BEFORE: operator.Subtraction,
+            OperatorCategory.OTHER: operator.Subtraction
+        }
+
+        # resolved overloads of '-' by the category of the previous symbol, computed once
+        self._minus_table: Dict[OperatorCategory, Operator] = {
+            category: self._get_overloaded_by_class('-', op_type)
+            for category, op_type in minus_overloads.items()
+        }
+
+        # functions that resolve each overloaded symbol
+        self._overload_handlers: Dict[str, Callable[[List[str], int, Optional[List[Optional[Operator]]]],
+                                                     Operator]] = {
+            '-': self._resolve_minus
+        }
+
+    def _build_op_dict(self) -> Dict[str, Any]:
+        """
+        Create all the operators of the calculator and build the operators dictionary.
+        :return: The new operators dictionary.
+        """
+        self._op_dict = {}
+
         self._add_op(operator.Addition())
         self._add_op(operator.Subtraction())
         self._add_op(operator.Multiplication())
@@ -174,27 +287,63 @@ class OmegaDefinedOperators(BaseDefinedOperators):
         self._add_op(operator.NegativeSign())
         self._add_op(operator.SumDigits())
 
-    def resolve_overloads(self, expression: List[str], position: int) -> Operator:
-        op_symbol = expression[position]
+        return self._op_dict
 
-        if op_symbol == '-':
-            if position <= 0:  # if the first symbol, must be unary minus
-                return self._get_overloaded_by_class(op_symbol, operator.Minus)
-
-            try:
-                prev_op = self.get_operator(expression, position - 1)
-            except ValueError:
-                # previous symbol was not an operator
-                return self._get_overloaded_by_class(op_symbol, operator.Subtraction)
-
-            if (isinstance(prev_op, operator.ContainerOperator)  # if start of an independent expression
-                    or isinstance(prev_op, operator.Minus)):  # or if the previous operator is unary minus
-                return self._get_overloaded_by_class(op_symbol, operator.Minus)
-            elif (isinstance(prev_op, operator.BinaryOperator)  # if after an operator that requires a value
-                  or (isinstance(prev_op, operator.UnaryOperator)
-                      and prev_op.get_operand_pos() == operator.UnaryOperator.OperandPos.AFTER)):
-                return self._get_overloaded_by_class(op_symbol, operator.NegativeSign)
-            else:  # default case
-                return self._get_overloaded_by_class(op_symbol, operator.Subtraction)
+    @staticmethod
+    def _categorize(op: Operator) -> OperatorCategory:
+        """
+        Get the category of an operator.
+        :param op: The operator to categorize.
+        :return: The category of the operator.
+        """
+        if isinstance(op, operator.ContainerOperator):
+            return OperatorCategory.CONTAINER
+        elif isinstance(op, operator.Minus):
+            return OperatorCategory.UNARY_MINUS
+        elif isinstance(op, operator.BinaryOperator):
+            return OperatorCategory.BINARY
+        elif isinstance(op, operator.UnaryOperator):
+            if op.get_operand_pos() == operator.UnaryOperator.OperandPos.AFTER:
+                return OperatorCategory.UNARY_AFTER
+
+            return OperatorCategory.UNARY_BEFORE
         else:
-            return self._op_dict[op_symbol]
+            return OperatorCategory.OTHER
+
+    def _get_previous_category(self, expression: List[str], position: int,
+                               op_cache: Optional[List[Optional[Operator]]] = None) -> OperatorCategory:
+        """
+        Get the category of the symbol before the given position in the expression.
+        :param expression: The expression of string symbols.
+        :param position: The index of the symbol after the one to categorize.
+        :param op_cache: Optional cache of the operators already resolved in this expression.
+        :return: The category of the previous symbol.
+        """
+        if position <= 0:
+            return OperatorCategory.NONE
+
+        try:
+            prev_op = self.get_operator(expression, position - 1, op_cache)
+        except ValueError:
+            # previous symbol was not an operator
+            return OperatorCategory.VALUE
+
+        return self._cat_of_type.get(type(prev_op), OperatorCategory.OTHER)
+
+    def _resolve_minus(self, expression: List[str], position: int,
+                       op_cache: Optional[List[Optional[Operator]]] = None) -> Operator:
+        """
+        Decide which overload of '-' is at the given position of the expression.
+        :param expression: The expression of string symbols.
+        :param position: The index of the '-' symbol.
+        :param op_cache: Optional cache of the operators already resolved in this expression.
+        :return: The correct operator for this position.
+        """
+        return self._minus_table[self._get_previous_category(expression, position, op_cache)]
+
+    def resolve_overloads(self, expression: List[str], position: int,
+                          op_cache: Optional[List[Optional[Operator]]] = None) -> Operator:
+        op_symbol = expression[position]
+        handler = self._overload_handlers.get(op_symbol)
+
+        return handler(expression, position, op_cache) if handler is not None else self._op_dict[op_symbol]
@@ -1,17 +1,17 @@
-from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+import re
+import sys
+from typing import Dict, List, Any, Optional, Callable
 
 from src.calculatorLogic import stack, operator, calc_utils, defined_operators
 from src.calculatorLogic.calc_errors import FormattingError
 from src.calculatorLogic.calc_utils import organize_whitespace
 
 
-class IFormatter(ABC):
+class IFormatter:
     """
     Interface for formatting a mathematical expression from the user to a readable format for a Solver.
     """
 
-    @abstractmethod
     def format_expression(self, expression: List[str]) -> List[Any]:
         """
         Format the string expression to a readable form by a solver.
@@ -19,16 +19,15 @@ class IFormatter(ABC):
         :return: A formatted symbol list expression
         :raises FormattingError: If an error occurred while formatting the expression.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def extract_symbols(self, expression: str) -> List[str]:
         """
         Extract the symbols from a string expression and organize them in a list.
         :param expression: Expression as string (usually from user input)
         :return: a list of math symbols
         """
-        pass
+        raise NotImplementedError
 
 
 class InfixToPostfixFormatter(IFormatter):
@@ -39,111 +38,151 @@ class InfixToPostfixFormatter(IFormatter):
 
     def __init__(self, defined_ops: defined_operators.IDefinedOperators):
         self._defined_ops = defined_ops
-
-        self._op_stack = stack.ListStack()  # stack for storing operators before inserting them in an expression
-        self._left_operators = stack.ListStack()  # stack for storing the left-operators (they behave a bit differently)
+        op_dict = defined_ops.get_operators_dict()
+
+        # the symbols of all the operators, used for fast symbol lookups
+        self._op_symbols = defined_ops.get_symbols()
+
+        # the priority of every defined operator, read once so comparing priorities needs no method calls
+        self._priority: Dict[operator.Operator, float] = {}
+        for op_entry in op_dict.values():
+            for op in (op_entry if isinstance(op_entry, list) else [op_entry]):
+                self._priority[op] = op.get_priority()
+
+        # the operators that are not overloaded, so their symbol alone decides the operator
+        self._single_ops: Dict[str, operator.Operator] = {symbol: op for (symbol, op) in op_dict.items()
+                                                          if not isinstance(op, list)}
+
+        # the left-operators (unary operators that come before their operand), so they are recognized with one lookup
+        self._left_unary_ops = frozenset(op for op in self._priority
+                                         if isinstance(op, operator.UnaryOperator)
+                                         and op.get_operand_pos() == operator.UnaryOperator.OperandPos.AFTER)
+
+        # the bound position check of every operator that has one, so the formatting loop finds it
+        # with a single lookup instead of checking the kind of each operator
+        self._position_checks: Dict[operator.Operator, Callable[..., None]] = {
+            op: op.check_position for op in self._priority
+            if isinstance(op, (operator.UnaryOperator, operator.BinaryOperator))
+        }
+
+        # sign operators look past any '-' symbols after them, their position check also takes the result of
+        # operator.find_next_non_minus() so a long run of '-' is not scanned again for every symbol in it
+        self._sign_ops = frozenset(op for op in self._priority if isinstance(op, operator.SignOperator))
+
+        # all operator and closing symbols. multi-character symbols come first (longest first) so the longest
+        # possible symbol is matched, single-character symbols are matched by one character set
+        op_symbols = set(defined_ops.get_symbols()) | set(defined_ops.get_end_symbols())
+        op_patterns = [re.escape(symbol) for symbol in sorted((s for s in op_symbols if len(s) > 1),
+                                                              key=len, reverse=True)]
+        single_char_symbols = "".join(sorted(s for s in op_symbols if len(s) == 1))
+        if single_char_symbols:
+            op_patterns.append("[" + "".join(re.escape(ch) for ch in single_char_symbols) + "]")
+        op_pattern = "|".join(op_patterns)
+
+        if len(op_patterns) == 1 and single_char_symbols:
+            # only single-character symbols, a word is simply a run of characters outside the set
+            word_pattern = "[^ " + "".join(re.escape(ch) for ch in single_char_symbols) + "]+"
+        else:
+            word_pattern = f"(?:(?!{op_pattern})[^ ])+"
+
+        # the tokenizer for extract_symbols. expressions are scanned by the (C implemented) regex engine in one call.
+        # numbers (of any unicode decimal digits, see calc_utils.is_float_str) may contain single spaces between
+        # their characters, words are any other run of characters that are not whitespace and do not start an
+        # operator symbol
+        self._token_re = re.compile(
+            r"(?P<number>\d(?: ?\d)*(?: ?\.(?: ?\d)*)?|\.\d(?: ?\d)*)"
+            rf"|(?P<operator>{op_pattern})"
+            rf"|(?P<word>{word_pattern})"
+        )
+
+        # stack for storing operators before inserting them in an expression
+        self._op_stack: stack.ListStack = stack.ListStack()
+        # stack for storing the left-operators (they behave a bit differently)
+        self._left_operators: stack.ListStack = stack.ListStack()
+
+        # the lists behind the stacks (so the stacks are ListStacks and not any IStack). the formatting loops work
+        # on them directly (the top is the last item), which saves a method call for every access to a stack
+        self._op_list = self._op_stack.items()
+        self._left_list = self._left_operators.items()
 
     def extract_symbols(self, expression: str) -> List[str]:
         symbol_list = []
-        temp_symbol = ""
 
         expression = organize_whitespace(expression)  # delete repeats of spaces
 
-        closing_symbols = self._defined_ops.get_end_symbols()
-
-        for i in range(len(expression)):
-            ch = expression[i]
-
-            if ch.isspace():
-                if (temp_symbol != ""
-                        and not calc_utils.is_float_str(temp_symbol)):  # make sure to only separate if not a number
-                    symbol_list.append(temp_symbol)
-                    temp_symbol = ""
-            elif ((temp_symbol + ch) in self._defined_ops.get_symbols()) or ((temp_symbol + ch) in closing_symbols):
-                # if this temp_symbol creates with this char a defined operator
-
-                symbol_list.append(temp_symbol + ch)
-                temp_symbol = ""
-            elif (ch in self._defined_ops.get_symbols()) or (ch in closing_symbols):
-                # if this char alone creates a defined operator
-
-                if temp_symbol != "":
-                    symbol_list.append(temp_symbol)
-                    temp_symbol = ""
+        for match in self._token_re.finditer(expression):
+            kind = match.lastgroup
 
-                symbol_list.append(ch)
-            elif calc_utils.is_float_str(temp_symbol) and not calc_utils.is_float_str(temp_symbol + ch):
-                # if at the end of a valid number
-
-                symbol_list.append(temp_symbol)
-                temp_symbol = ""
-
-                temp_symbol += ch
+            if kind == "number":
+                # a number can be split by spaces ("1 2.3" is "12.3")
+                symbol_list.append(match.group().replace(" ", ""))
+            elif kind == "operator":
+                # operator symbols are interned so looking them up in the operators dictionary is cheaper
+                symbol_list.append(sys.intern(match.group()))
             else:
-                temp_symbol += ch
-
-        if temp_symbol != "":
-            symbol_list.append(temp_symbol)
+                symbol_list.append(match.group())
 
         return symbol_list
 
     # helper function
     def insert_operator(self, op: operator.Operator, postfix_expression: List[Any],
-                        opened_containers: Dict[operator.ContainerOperator, int]) -> None:
+                        opened_containers: Dict[str, int]) -> None:
         """
         Insert the operator to the stack. This function also makes sure to append the operators with higher priority
         to the final expression so the order of operations will apply.
         :param op: The operator to insert.
         :param postfix_expression: The current formatted expression to append to.
-        :param opened_containers: The current opened containers dictionary.
+        :param opened_containers: The current opened containers dictionary (counts by end symbol).
         """
+        priority = self._priority
+        op_stack = self._op_list
+        left_operators = self._left_list
+
         # if operator is a left unary operator, push to left_operators without performing any checks for now
-        if (isinstance(op, operator.UnaryOperator)
-                and op.get_operand_pos() == operator.UnaryOperator.OperandPos.AFTER):
-            self._left_operators.push(op)
+        if op in self._left_unary_ops:
+            left_operators.append(op)
         else:
-            if ((self._op_stack.is_empty()
-                 or op.get_priority() > self._op_stack.top().get_priority()
-                 or isinstance(self._op_stack.top(),
-                               operator.ContainerOperator))  # ignore priority at the start of a container
-                    and (self._left_operators.is_empty()
-                         or op.get_priority() > self._left_operators.top().get_priority()
-                         or isinstance(self._left_operators.top(), operator.ContainerOperator))):
+            op_priority = priority[op]
+
+            if ((not op_stack
+                 or op_priority > priority[op_stack[-1]]
+                 or op_stack[-1].is_container)  # ignore priority at the start of a container
+                    and (not left_operators
+                         or op_priority > priority[left_operators[-1]]
+                         or left_operators[-1].is_container)):
                 # if the operator has higher priority than everything else already pushed
-                self._op_stack.push(op)
+                op_stack.append(op)
             else:
                 # while the current operator has less priority than the top of the stack
-                while ((not self._op_stack.is_empty())
-                       and op.get_priority() <= self._op_stack.top().get_priority()
-                       and not isinstance(self._op_stack.top(), operator.ContainerOperator)):
+                while (op_stack
+                       and op_priority <= priority[op_stack[-1]]
+                       and not op_stack[-1].is_container):
 
                     # if the current top left-operator has the highest priority
-                    if ((not self._left_operators.is_empty()) and self._left_operators.top().get_priority()
-                            >= self._op_stack.top().get_priority()
-                            and not isinstance(self._left_operators.top(), operator.ContainerOperator)):
-                        postfix_expression.append(self._left_operators.pop())
+                    if (left_operators and priority[left_operators[-1]] >= priority[op_stack[-1]]
+                            and not left_operators[-1].is_container):
+                        postfix_expression.append(left_operators.pop())
                     else:
                         # if the current regular operator at the top of the stack has the highest priority
-                        postfix_expression.append(self._op_stack.pop())
+                        postfix_expression.append(op_stack.pop())
 
                 # check for the case that all regular operators have less priority than the current operator but
                 # the left-operators have more priority the current operator
-                while ((not self._left_operators.is_empty())
-                       and self._left_operators.top().get_priority() >= op.get_priority()
-                       and not isinstance(self._left_operators.top(), operator.ContainerOperator)):
-                    postfix_expression.append(self._left_operators.pop())
+                while (left_operators
+                       and priority[left_operators[-1]] >= op_priority
+                       and not left_operators[-1].is_container):
+                    postfix_expression.append(left_operators.pop())
 
                 # after all for the operators with higher priority have been inserted to the final expression
-                self._op_stack.push(op)
+                op_stack.append(op)
 
             # track opened containers
             # counts the number of closing symbols that should appear later
-            if isinstance(op, operator.ContainerOperator):
-                if not op in opened_containers.keys():
-                    opened_containers[op] = 0
+            if op.is_container:
+                end_symbol = op.get_end_symbol()
+                opened_containers[end_symbol] = opened_containers.get(end_symbol, 0) + 1
 
-                opened_containers[op] += 1
-                self._left_operators.push(op)
+                left_operators.append(op)
 
     # helper function
     def free_until_start_of_container(self, postfix_expression: List[Any]) -> None:
@@ -153,77 +192,122 @@ class InfixToPostfixFormatter(IFormatter):
         the opening container.
         :param postfix_expression: The current formatted expression to append to.
         """
+        priority = self._priority
+        op_stack = self._op_list
+        left_operators = self._left_list
+
         # while not reached opening symbol
-        while not isinstance(self._op_stack.top(), operator.ContainerOperator):
+        while not op_stack[-1].is_container:
             # if there is a left-operator with higher priority
-            if (self._left_operators.top().get_priority() >= self._op_stack.top().get_priority()
-                    and not isinstance(self._left_operators.top(), operator.ContainerOperator)):
-                postfix_expression.append(self._left_operators.pop())
+            if (priority[left_operators[-1]] >= priority[op_stack[-1]]
+                    and not left_operators[-1].is_container):
+                postfix_expression.append(left_operators.pop())
 
-            postfix_expression.append(self._op_stack.pop())
+            postfix_expression.append(op_stack.pop())
 
         # if all regular operators have been freed but there are still left-operators before the container symbol
-        while not isinstance(self._left_operators.top(), operator.ContainerOperator):
-            postfix_expression.append(self._left_operators.pop())
+        while not left_operators[-1].is_container:
+            postfix_expression.append(left_operators.pop())
 
     def format_expression(self, expression: List[str]) -> List[Any]:
-        self._op_stack.empty()
-        self._left_operators.empty()
+        # bound to locals once, the loop below runs for every symbol
+        priority = self._priority
+        op_stack = self._op_list
+        left_operators = self._left_list
+        op_symbols = self._op_symbols
+        single_ops = self._single_ops
+        left_unary_ops = self._left_unary_ops
+        position_checks = self._position_checks
+        sign_ops = self._sign_ops
+        defined_ops = self._defined_ops
+        get_operator = defined_ops.get_operator
+        insert_operator = self.insert_operator
+        free_until_start_of_container = self.free_until_start_of_container
+        is_float_str = calc_utils.is_float_str
+
+        op_stack.clear()
+        left_operators.clear()
         postfix_expression = []
+        append = postfix_expression.append
+
+        # A dictionary storing the end symbols of currently opened container operators waiting to be closed.
+        # Used for checking if a symbol is a closing symbol of a container with a single lookup.
+        # This dictionary also counts the number of currently open containers with this end symbol
+        opened_containers: Dict[str, int] = {}
+
+        # the operators resolved at each position of the expression, so resolving overloads (which looks at
+        # the previous operators) never resolves the same position twice. operators that are not overloaded
+        # are filled in up front, in a single pass, so the position checks can read their neighbours directly
+        op_cache: List[Optional[operator.Operator]] = [single_ops.get(symbol) for symbol in expression]
+        next_non_minus: Optional[List[int]] = None  # built on the first sign operator
+
+        for i, symbol in enumerate(expression):
+            # operators are checked first since they are the most common and cheapest to recognize
+            if symbol in op_symbols:  # if symbol is an operator
+                curr_op = op_cache[i]
+                if curr_op is None:
+                    curr_op = get_operator(expression, i, op_cache)  # overloaded, depends on the context
 
-        # A dictionary storing currently opened container operators waiting to be closed.
-        # Used for checking if a char is a closing char of a container.
-        # This dictionary also counts the number of currently open containers of this type
-        opened_containers: Dict[operator.ContainerOperator, int] = {}
+                # should throw an exception if the operator is in an illegal position
+                check_position = position_checks.get(curr_op)
+                if check_position is not None:
+                    if curr_op in sign_ops:
+                        if next_non_minus is None:
+                            next_non_minus = operator.find_next_non_minus(expression)
 
-        for i in range(len(expression)):
-            symbol = expression[i]
+                        check_position(expression, i, defined_ops, op_cache, next_non_minus)
+                    else:
+                        check_position(expression, i, defined_ops, op_cache)
+
+                if curr_op in left_unary_ops:
+                    left_operators.append(curr_op)  # same as insert_operator() for a left-operator
+                else:
+                    insert_operator(curr_op, postfix_expression, opened_containers)
+            elif symbol in opened_containers:  # if symbol is a closing symbol
+                free_until_start_of_container(postfix_expression)
+
+                curr_op = op_stack.pop()  # pop the container symbol form the stack
+
+                # add the container symbol to final expression, unless it only groups its contents (like brackets)
+                # and would not change the value
+                if not curr_op.is_grouping:
+                    append(curr_op)
+                elif op_cache[i - 1] is curr_op:
+                    # nothing was grouped, and without the container in the final expression the solver would
+                    # not notice the missing value
+                    raise FormattingError(f"Error: Missing a value inside '{curr_op.get_symbol()}{symbol}'", i)
+
+                end_symbol = curr_op.get_end_symbol()
+                opened_containers[end_symbol] -= 1  # reduce opened containers count
+                left_operators.pop()  # also pop the container symbol from the left operators stack
 
-            if calc_utils.is_float_str(symbol):
+                # if the count of this container reached 0, delete it from the dictionary
+                if opened_containers[end_symbol] == 0:
+                    opened_containers.pop(end_symbol)
+            elif is_float_str(symbol):
                 try:
-                    postfix_expression.append(float(symbol))
+                    append(float(symbol))
                 except ValueError:
                     raise FormattingError(f"Error: Failed to cast '{symbol}' to a floating point value", i)
-            elif symbol in [k.get_end_symbol() for k in opened_containers.keys()]:  # if symbol is a closing symbol
-                self.free_until_start_of_container(postfix_expression)
-
-                curr_op = self._op_stack.pop()  # pop the container symbol form the stack
-                postfix_expression.append(curr_op)  # add the container symbol to final expression
-
-                opened_containers[curr_op] -= 1  # reduce opened containers count
-                self._left_operators.pop()  # also pop the container symbol from the left operators stack
-
-                # if the count of this container reached 0, delete it from the dictionary
-                if opened_containers[curr_op] == 0:
-                    opened_containers.pop(curr_op)
-            elif symbol in self._defined_ops.get_symbols():  # if symbol is an operator
-                curr_op = self._defined_ops.get_operator(expression, i)
-
-                # should throw an exception if the operator is in an illegal position
-                if isinstance(curr_op, (operator.UnaryOperator, operator.BinaryOperator)):
-                    curr_op.check_position(expression, i, self._defined_ops)
-
-                self.insert_operator(curr_op, postfix_expression, opened_containers)
             else:
                 raise FormattingError(f"Error: Invalid expression, did not recognize symbol '{symbol}'", i)
 
         # empty the operator stack if at the end of the expression
-        while not self._op_stack.is_empty():
-            curr_op = self._op_stack.pop()
+        while op_stack:
+            curr_op = op_stack.pop()
 
             # if there are still left-operators with higher priority
-            while ((not self._left_operators.is_empty())
-                   and self._left_operators.top().get_priority() >= curr_op.get_priority()):
-                postfix_expression.append(self._left_operators.pop())
+            while left_operators and priority[left_operators[-1]] >= priority[curr_op]:
+                append(left_operators.pop())
 
             # if a container is encountered here, it has not been closed in the middle of the expression
-            if isinstance(curr_op, operator.ContainerOperator):
+            if curr_op.is_container:
                 raise FormattingError(f"Error: Unclosed container '{curr_op.get_symbol()}', "
                                       f"missing '{curr_op.get_end_symbol()}'")
 
-            postfix_expression.append(curr_op)
+            append(curr_op)
 
-        while not self._left_operators.is_empty():
-            postfix_expression.append(self._left_operators.pop())
+        while left_operators:
+            append(left_operators.pop())
 
         return postfix_expression
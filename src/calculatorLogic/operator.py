@@ -1,7 +1,7 @@
+import functools
 import math
-from abc import abstractmethod
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from src.calculatorLogic import calc_utils, defined_operators
 from src.calculatorLogic.calc_errors import CalculationError, FormattingError
@@ -9,7 +9,19 @@ from src.calculatorLogic.defined_operators import Operator
 
 HIGHEST_OPERATOR_PRIORITY = 999  # All operators should have equal or lower priority from this value
 
-MAX_ITER = 10000  # The max amount of full iterations allowed for the calculator to perform on a single operation
+MAX_FACTORIAL = 170  # The largest number whose factorial fits in a float, larger results are rejected
+
+FACTORIAL_CACHE_SIZE = 256  # The max amount of factorial results remembered by the calculator
+
+
+@functools.lru_cache(maxsize=FACTORIAL_CACHE_SIZE)
+def _factorial(n: int) -> float:
+    """
+    Calculate the factorial of a whole non-negative number as a float. Results are cached.
+    :param n: The number, at most MAX_FACTORIAL (so every result fits in a float and can be cached).
+    :return: n! as a floating point number.
+    """
+    return float(math.factorial(n))
 
 
 # Subclasses of Operator
@@ -20,6 +32,8 @@ class UnaryOperator(Operator):
     Examples: factorial(!), negation(~)
     """
 
+    __slots__ = ()
+
     class OperandPos(Enum):
         """
         This class indicates the position of the operand relative to the
@@ -31,10 +45,13 @@ class UnaryOperator(Operator):
 
     _operand_pos: OperandPos
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.is_unary_before = getattr(cls, "_operand_pos", None) == UnaryOperator.OperandPos.BEFORE
+
     def get_operand_pos(self):
         return self._operand_pos
 
-    @abstractmethod
     def operate(self, num: float) -> float:
         """
         Perform the operation on the number and return a result.
@@ -42,28 +59,34 @@ class UnaryOperator(Operator):
         :return: The result of the operation as a floating point number
         :raises CalculationError: If the operation failed because of its calculation
         """
-        pass
+        raise NotImplementedError
 
     def check_position(self, expression: List[str], position: int,
-                       defined_ops: defined_operators.IDefinedOperators) -> None:
+                       defined_ops: defined_operators.IDefinedOperators,
+                       op_cache: Optional[List[Optional[Operator]]] = None) -> None:
         """
         Checks if the given position is legal for this operator. raises an exception if the position
         is illegal for the operator.
         :param expression: The expression as string list before formatting.
         :param position: The position in the expression.
         :param defined_ops: The object containing the defined operators.
+        :param op_cache: Optional cache of the operators already resolved in this expression
+            (see IDefinedOperators.get_operator).
         :raises FormattingError: If the position is illegal
         """
         if self._operand_pos == UnaryOperator.OperandPos.BEFORE:
             if position < 1:
                 raise FormattingError(f"Error: Missing a value before '{self._symbol}'", position)
 
-            if defined_ops.is_operator(expression, position - 1):
-                prev_op = defined_ops.get_operator(expression, position - 1)
+            # an already resolved operator is read directly, without looking up the symbol again
+            prev_op = op_cache[position - 1] if op_cache is not None else None
+            if prev_op is None and defined_ops.is_operator(expression, position - 1):
+                prev_op = defined_ops.get_operator(expression, position - 1, op_cache)
 
-                if isinstance(prev_op, UnaryOperator) and prev_op.get_operand_pos() == UnaryOperator.OperandPos.BEFORE:
+            if prev_op is not None:
+                if prev_op.is_unary_before:
                     return
-                elif isinstance(prev_op, ContainerOperator):
+                elif prev_op.is_container:
                     raise FormattingError(f"Error: Missing a value before '{self._symbol}'", position)
                 else:
                     raise FormattingError(f"Error: '{self._symbol}' cannot come after an operator", position)
@@ -82,7 +105,8 @@ class BinaryOperator(Operator):
     Examples: addition(+), division(/)
     """
 
-    @abstractmethod
+    __slots__ = ()
+
     def operate(self, num1: float, num2: float) -> float:
         """
         Perform the operation on the numbers and return a result.
@@ -91,27 +115,33 @@ class BinaryOperator(Operator):
         :return: The result of the operation as a floating point number
         :raises CalculationError: If the operation failed because of its calculation
         """
-        pass
+        raise NotImplementedError
 
     def check_position(self, expression: List[str], position: int,
-                       defined_ops: defined_operators.IDefinedOperators) -> None:
+                       defined_ops: defined_operators.IDefinedOperators,
+                       op_cache: Optional[List[Optional[Operator]]] = None) -> None:
         """
         Checks if the given position is legal for this operator. raises an exception if the position
         is illegal for the operator.
         :param expression: The expression as string list before formatting.
         :param position: The position in the expression.
         :param defined_ops: The object containing the defined operators.
+        :param op_cache: Optional cache of the operators already resolved in this expression
+            (see IDefinedOperators.get_operator).
         :raises FormattingError: If the position is illegal
         """
         if position < 1:
             raise FormattingError(f"Error: Missing a value before '{self._symbol}'", position)
 
-        if defined_ops.is_operator(expression, position - 1):
-            prev_op = defined_ops.get_operator(expression, position - 1)
+        # an already resolved operator is read directly, without looking up the symbol again
+        prev_op = op_cache[position - 1] if op_cache is not None else None
+        if prev_op is None and defined_ops.is_operator(expression, position - 1):
+            prev_op = defined_ops.get_operator(expression, position - 1, op_cache)
 
-            if isinstance(prev_op, UnaryOperator) and prev_op.get_operand_pos() == UnaryOperator.OperandPos.BEFORE:
+        if prev_op is not None:
+            if prev_op.is_unary_before:
                 return
-            elif isinstance(prev_op, ContainerOperator):
+            elif prev_op.is_container:
                 raise FormattingError(f"Error: Missing a value before '{self._symbol}'", position)
             else:
                 raise FormattingError(f"Error: '{self._symbol}' cannot come after an operator", position)
@@ -130,8 +160,17 @@ class ContainerOperator(Operator):
     Examples: brackets(())
     (could be used for other purposes like implementing sin(x) or other functions)
     """
+
+    __slots__ = ()
+
     _end_symbol: str
 
+    is_container = True
+
+    # ``True`` if the container only groups its contents and does not change their value (like brackets).
+    # Such containers only guide the order of operations, so they are left out of formatted expressions
+    is_grouping: bool = False
+
     def get_end_symbol(self):
         """
         Get the symbol representing the end of the operation in a math expression.
@@ -139,7 +178,6 @@ class ContainerOperator(Operator):
         """
         return self._end_symbol
 
-    @abstractmethod
     def operate(self, num: float) -> float:
         """
         Perform the operation on the number and return a result.
@@ -147,7 +185,7 @@ class ContainerOperator(Operator):
         :return: The result of the operation as a floating point number
         :raises CalculationError: If the operation failed because of its calculation
         """
-        pass
+        raise NotImplementedError
 
 
 # The actual operators are implemented here
@@ -160,9 +198,10 @@ class Addition(BinaryOperator):
     In an expression: a + b
     """
 
-    def __init__(self):
-        self._symbol = '+'
-        self._priority = 1
+    __slots__ = ()
+
+    _symbol = '+'
+    _priority = 1
 
     def operate(self, num1: float, num2: float) -> float:
         return num1 + num2
@@ -177,9 +216,10 @@ class Subtraction(BinaryOperator):
     In an expression: a - b
     """
 
-    def __init__(self):
-        self._symbol = '-'
-        self._priority = 1
+    __slots__ = ()
+
+    _symbol = '-'
+    _priority = 1
 
     def operate(self, num1: float, num2: float) -> float:
         return num1 - num2
@@ -194,9 +234,10 @@ class Multiplication(BinaryOperator):
     In an expression: a * b
     """
 
-    def __init__(self):
-        self._symbol = '*'
-        self._priority = 2
+    __slots__ = ()
+
+    _symbol = '*'
+    _priority = 2
 
     def operate(self, num1: float, num2: float) -> float:
         return num1 * num2
@@ -211,15 +252,16 @@ class Division(BinaryOperator):
     In an expression: a / b
     """
 
-    def __init__(self):
-        self._symbol = '/'
-        self._priority = 2
+    __slots__ = ()
 
-    def operate(self, num1: float, num2: float) -> float:
-        if num2 == 0:
-            raise CalculationError("Error: Cannot divide by zero")
+    _symbol = '/'
+    _priority = 2
 
-        return num1 / num2
+    def operate(self, num1: float, num2: float) -> float:
+        try:
+            return num1 / num2
+        except ZeroDivisionError:
+            raise CalculationError("Error: Cannot divide by zero") from None
 
 
 class Power(BinaryOperator):
@@ -231,9 +273,10 @@ class Power(BinaryOperator):
     In an expression: a ^ b
     """
 
-    def __init__(self):
-        self._symbol = '^'
-        self._priority = 3
+    __slots__ = ()
+
+    _symbol = '^'
+    _priority = 3
 
     def operate(self, num1: float, num2: float) -> float:
         if num1 < 0 and -1 < num2 < 1:
@@ -260,15 +303,16 @@ class Modulo(BinaryOperator):
     In an expression: a % b
     """
 
-    def __init__(self):
-        self._symbol = '%'
-        self._priority = 4
+    __slots__ = ()
 
-    def operate(self, num1: float, num2: float) -> float:
-        if num2 == 0:
-            raise CalculationError(f"Error: Cannot perform modulo by zero ({num1} % 0 = ???)")
+    _symbol = '%'
+    _priority = 4
 
-        return num1 % num2
+    def operate(self, num1: float, num2: float) -> float:
+        try:
+            return num1 % num2
+        except ZeroDivisionError:
+            raise CalculationError(f"Error: Cannot perform modulo by zero ({num1} % 0 = ???)") from None
 
 
 class Max(BinaryOperator):
@@ -280,9 +324,10 @@ class Max(BinaryOperator):
     In an expression: a $ b
     """
 
-    def __init__(self):
-        self._symbol = '$'
-        self._priority = 5
+    __slots__ = ()
+
+    _symbol = '$'
+    _priority = 5
 
     def operate(self, num1: float, num2: float) -> float:
         return num1 if num1 > num2 else num2
@@ -297,9 +342,10 @@ class Min(BinaryOperator):
     In an expression: a & b
     """
 
-    def __init__(self):
-        self._symbol = '&'
-        self._priority = 5
+    __slots__ = ()
+
+    _symbol = '&'
+    _priority = 5
 
     def operate(self, num1: float, num2: float) -> float:
         return num1 if num1 < num2 else num2
@@ -314,80 +360,124 @@ class Average(BinaryOperator):
     In an expression: a @ b
     """
 
-    def __init__(self):
-        self._symbol = '@'
-        self._priority = 5
+    __slots__ = ()
+
+    _symbol = '@'
+    _priority = 5
 
     def operate(self, num1: float, num2: float) -> float:
-        return (num1 + num2) / 2.0
+        return (num1 + num2) * 0.5
 
 
-class Negation(UnaryOperator):
+class SignOperator(UnaryOperator):
     """
-    The unary operator for negation.
+    A unary operator that flips the sign of the number after it. Any amount of '-' symbols may come between
+    the operator and its operand.
 
-    Symbol: '~'
-
-    In an expression: ~x
+    Examples: negation(~), unary minus(-)
     """
 
-    def __init__(self):
-        self._symbol = '~'
-        self._priority = 6
-        self._operand_pos = UnaryOperator.OperandPos.AFTER
+    __slots__ = ()
+
+    _operand_pos = UnaryOperator.OperandPos.AFTER
+
+    # whether the operand may be a container (like brackets) and not only a number
+    _container_operand: bool = True
 
     def operate(self, num: float) -> float:
         return -num
 
     def check_position(self, expression: List[str], position: int,
-                       defined_ops: defined_operators.IDefinedOperators) -> None:
-        super().check_position(expression, position, defined_ops)
+                       defined_ops: defined_operators.IDefinedOperators,
+                       op_cache: Optional[List[Optional[Operator]]] = None,
+                       next_non_minus: Optional[List[int]] = None) -> None:
+        """
+        Checks if the given position is legal for this operator. raises an exception if the position
+        is illegal for the operator.
+        :param expression: The expression as string list before formatting.
+        :param position: The position in the expression.
+        :param defined_ops: The object containing the defined operators.
+        :param op_cache: Optional cache of the operators already resolved in this expression
+            (see IDefinedOperators.get_operator).
+        :param next_non_minus: Optional result of find_next_non_minus() for this expression, so the
+            operand is found without scanning over the '-' symbols after the operator.
+        :raises FormattingError: If the position is illegal
+        """
+        super().check_position(expression, position, defined_ops, op_cache)
 
-        for i in range(position + 1, len(expression)):
-            if calc_utils.is_float_str(expression[i]):
-                return
-            elif not expression[i] == '-':
-                raise FormattingError(f"Error: '{self._symbol}' cannot come before '{expression[i]}'", i)
+        if next_non_minus is not None:
+            i = next_non_minus[position + 1]
+        else:
+            i = position + 1
+            while i < len(expression) and expression[i] == '-':
+                i += 1
 
-        raise FormattingError(f"Error: Missing a value after '{self._symbol}'", position)
+        if i == len(expression):
+            raise FormattingError(f"Error: Missing a value after '{self._symbol}'", position)
+
+        if (calc_utils.is_float_str(expression[i])
+                or (self._container_operand
+                    and defined_ops.is_operator(expression, i)
+                    and defined_ops.get_operator(expression, i, op_cache).is_container)):
+            return  # only if it has a number (or a container if allowed) to its right
+
+        raise FormattingError(f"Error: '{self._symbol}' cannot come before '{expression[i]}'", i)
 
 
-class Minus(UnaryOperator):
+def find_next_non_minus(expression: List[str]) -> List[int]:
     """
-    The unary operator for flipping a number's sign (lower priority).
+    Find for every position of the expression the nearest position at or after it that is not a '-' symbol.
+    Computed once per expression, so each SignOperator finds its operand without scanning the '-' symbols.
+    :param expression: The expression as string list before formatting.
+    :return: A list with the nearest such position for every position, ``len(expression)`` if there is none.
+    """
+    next_non_minus = [0] * len(expression)
+    next_pos = len(expression)
 
-    Symbol: '-'
+    for i in range(len(expression) - 1, -1, -1):
+        if expression[i] != '-':
+            next_pos = i
 
-    In an expression: -x
+        next_non_minus[i] = next_pos
+
+    return next_non_minus
+
+
+class Negation(SignOperator):
     """
+    The unary operator for negation.
 
-    def __init__(self):
-        self._symbol = "-"
-        self._priority = 3.5
-        self._operand_pos = UnaryOperator.OperandPos.AFTER
+    Symbol: '~'
 
-    def operate(self, num: float) -> float:
-        return -num
+    In an expression: ~x
+    """
 
-    def check_position(self, expression: List[str], position: int,
-                       defined_ops: defined_operators.IDefinedOperators) -> None:
-        super().check_position(expression, position, defined_ops)
+    __slots__ = ()
+
+    _symbol = '~'
+    _priority = 6
+    _container_operand = False
+
+
+class Minus(SignOperator):
+    """
+    The unary operator for flipping a number's sign (lower priority).
+
+    Symbol: '-'
+
+    In an expression: -x
+    """
 
-        for i in range(position + 1, len(expression)):
-            if (calc_utils.is_float_str(expression[i])
-                    or (defined_ops.is_operator(expression, i)
-                        and isinstance(defined_ops.get_operator(expression, i), ContainerOperator))):
-                return  # only if it has a number or a container to its right
-            elif not expression[i] == '-':
-                raise FormattingError(f"Error: '{self._symbol}' cannot come before '{expression[i]}'", i)
+    __slots__ = ()
 
-        raise FormattingError(f"Error: Missing a value after '{self._symbol}'", position)
+    _symbol = "-"
+    _priority = 3.5
 
     def __str__(self) -> str:
         return self._symbol + " (unary minus)"
 
 
-class NegativeSign(UnaryOperator):
+class NegativeSign(SignOperator):
     """
     The unary operator for flipping a number's sign.
 
@@ -396,27 +486,10 @@ class NegativeSign(UnaryOperator):
     In an expression: -x
     """
 
-    def __init__(self):
-        self._symbol = "-"
-        self._priority = 10
-        self._operand_pos = UnaryOperator.OperandPos.AFTER
-
-    def operate(self, num: float) -> float:
-        return -num
-
-    def check_position(self, expression: List[str], position: int,
-                       defined_ops: defined_operators.IDefinedOperators) -> None:
-        super().check_position(expression, position, defined_ops)
-
-        for i in range(position + 1, len(expression)):
-            if (calc_utils.is_float_str(expression[i])
-                    or (defined_ops.is_operator(expression, i)
-                        and isinstance(defined_ops.get_operator(expression, i), ContainerOperator))):
-                return  # only if it has a number or a container to its right
-            elif not expression[i] == '-':
-                raise FormattingError(f"Error: '{self._symbol}' cannot come before '{expression[i]}'", i)
+    __slots__ = ()
 
-        raise FormattingError(f"Error: Missing a value after '{self._symbol}'", position)
+    _symbol = "-"
+    _priority = 10
 
     def __str__(self) -> str:
         return self._symbol + " (sign)"
@@ -431,10 +504,11 @@ class Factorial(UnaryOperator):
     In an expression: x!
     """
 
-    def __init__(self):
-        self._symbol = '!'
-        self._priority = 6
-        self._operand_pos = UnaryOperator.OperandPos.BEFORE
+    __slots__ = ()
+
+    _symbol = '!'
+    _priority = 6
+    _operand_pos = UnaryOperator.OperandPos.BEFORE
 
     def operate(self, num: float) -> float:
         if num < 0:
@@ -443,19 +517,12 @@ class Factorial(UnaryOperator):
         if num % 1 != 0:
             raise CalculationError(f"Error: Can only calculate the factorial of a whole number ({num}! = ???)")
 
-        res = 1.0
-
-        # if the amount of iterations is bigger than the max of allowed iterations, raise an error
-        if round(num) + 1 > MAX_ITER:
+        # the factorial of a larger number would only overflow when converted to a float, after math.factorial
+        # already built a huge integer for it, so it is rejected before calculating
+        if round(num) > MAX_FACTORIAL:
             raise CalculationError(f"Error: The result of {num}! is too large")
 
-        for i in range(1, round(num) + 1):
-            res *= i
-
-        if str(res) == "inf":
-            raise CalculationError(f"Error: The result of {num}! is too large")
-
-        return res
+        return _factorial(round(num))
 
 
 class SumDigits(UnaryOperator):
@@ -467,14 +534,15 @@ class SumDigits(UnaryOperator):
     In an expression: x#
     """
 
+    __slots__ = ()
+
     # avoids subtle bugs involving floating point precision
     MAX_NUMBER_DIGITS = 12
     ROUNDING_DIGITS = 14
 
-    def __init__(self):
-        self._symbol = '#'
-        self._priority = 6
-        self._operand_pos = UnaryOperator.OperandPos.BEFORE
+    _symbol = '#'
+    _priority = 6
+    _operand_pos = UnaryOperator.OperandPos.BEFORE
 
     def operate(self, num: float) -> float:
         if num < 0:
@@ -506,10 +574,12 @@ class Brackets(ContainerOperator):
     In an expression: (x)
     """
 
-    def __init__(self):
-        self._symbol = '('
-        self._end_symbol = ')'
-        self._priority = HIGHEST_OPERATOR_PRIORITY  # brackets will always have the highest priority
+    __slots__ = ()
+
+    _symbol = '('
+    _end_symbol = ')'
+    is_grouping = True
+    _priority = HIGHEST_OPERATOR_PRIORITY  # brackets will always have the highest priority
 
     def operate(self, num: float) -> float:
         return num  # brackets do not change the value given to them
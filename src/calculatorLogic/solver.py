@@ -1,18 +1,16 @@
-from abc import ABC, abstractmethod
 from typing import List, Any
 
-from src.calculatorLogic import stack, operator, defined_operators
+from src.calculatorLogic import operator, defined_operators
 from src.calculatorLogic.calc_errors import SolvingError
 
 ROUNDING_DIGITS = 14
 
 
-class ISolver(ABC):
+class ISolver:
     """
     Interface for solving a mathematical expression.
     """
 
-    @abstractmethod
     def solve(self, formatted_expression: List[Any]) -> float:
         """
         Solve the given expression and return a numerical answer
@@ -21,7 +19,7 @@ class ISolver(ABC):
         :return: A floating point number representing the answer to the mathematical expression.
         :raises SolvingError: If an error occurred while solving the mathematical expression.
         """
-        pass
+        raise NotImplementedError
 
 
 class PostfixSolver(ISolver):
@@ -29,45 +27,63 @@ class PostfixSolver(ISolver):
     Class for solving mathematical expressions in postfix notation.
     """
 
-    def solve(self, formatted_expression: List[Any]) -> float:
-        operand_stack = stack.ListStack()
+    def compile(self, formatted_expression: List[Any]) -> List[float]:
+        """
+        Calculate all the operations of a postfix expression. Every operand is a known number, so the whole
+        expression is calculated here and only the checks of the final result are left for execute().
+        :param formatted_expression: The formatted mathematical expression as a list.
+        :return: The operands left on the operand stack (a single one for a valid expression).
+        :raises SolvingError: If the expression contains a symbol that cannot be solved or an operator
+            is missing operands.
+        :raises CalculationError: If an operation failed because of its calculation.
+        """
+        operands = []
+        push = operands.append
+        pop = operands.pop
 
         for symbol in formatted_expression:
             if isinstance(symbol, float):
-                operand_stack.push(symbol)
+                push(symbol)
             elif isinstance(symbol, defined_operators.Operator):
+                # missing operands are reported before calculating, so errors come in the order of the expression
                 if isinstance(symbol, operator.BinaryOperator):
-                    try:
-                        # reverse order because of stack (LIFO)
-                        num2 = operand_stack.pop()
-                        num1 = operand_stack.pop()
-
-                        result = symbol.operate(num1, num2)
-
-                        operand_stack.push(result)
-                    except IndexError:
+                    if len(operands) < 2:
                         raise SolvingError(f"Error: Not enough operands for {str(symbol)}")
-                elif isinstance(symbol, (operator.UnaryOperator, operator.ContainerOperator)):
-                    try:
-                        num1 = operand_stack.pop()
-                        result = symbol.operate(num1)
 
-                        operand_stack.push(result)
-                    except IndexError:
+                    # reverse order because of stack (LIFO)
+                    num2 = pop()
+                    num1 = pop()
+                    push(symbol.operate(num1, num2))
+                elif isinstance(symbol, (operator.UnaryOperator, operator.ContainerOperator)):
+                    if not operands:
                         raise SolvingError(f"Error: Not enough operands for {str(symbol)}")
+
+                    push(symbol.operate(pop()))
                 else:
                     raise SolvingError(f"Error: Does not recognise the operator {str(symbol)}")
             else:
                 raise SolvingError(f"Error: Does not recognise {str(symbol)}")
 
-        if len(operand_stack) > 1:
+        return operands
+
+    def execute(self, operands: List[float]) -> float:
+        """
+        Check the operands left by compile() and return the answer as a floating point number.
+        :param operands: The operands returned by compile(). They are not modified.
+        :return: A floating point number representing the answer to the mathematical expression.
+        :raises SolvingError: If the operands do not form a single answer.
+        """
+        if len(operands) > 1:
             raise SolvingError(
                 f"Error: Too many operands! (each operand should be tied to the expression by some operator)")
 
-        if operand_stack.is_empty():
+        if not operands:
             raise SolvingError(f"Error: Empty expression!")
 
-        result = operand_stack.pop()
+        result = operands[0]
 
         # round the result number to avoid floating point operations errors
         return float(format(result, f".{ROUNDING_DIGITS}g"))
+
+    def solve(self, formatted_expression: List[Any]) -> float:
+        return self.execute(self.compile(formatted_expression))
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List
 
 
 class IStack(ABC):
@@ -80,5 +80,14 @@ class ListStack(IStack):
     def empty(self) -> None:
         self._items.clear()
 
+    def items(self) -> List[Any]:
+        """
+        Get the list storing the items of the stack (not a copy), the top of the stack is the last item.
+        Changes to the list change the stack, so it can be used directly by performance critical code.
+        Only available for this implementation, it is not part of IStack.
+        :return: The list of the items in the stack
+        """
+        return self._items
+
     def __len__(self) -> int:
         return len(self._items)
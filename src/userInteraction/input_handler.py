@@ -1,14 +1,10 @@
-from abc import ABC, abstractmethod
-
-
-class IInputHandler(ABC):
-    @abstractmethod
+class IInputHandler:
     def get_input_str(self) -> str:
         """
         Get input from the user as a string.
         :return: string of input from the user
         """
-        pass
+        raise NotImplementedError
 
 
 class ConsoleInputHandler(IInputHandler):
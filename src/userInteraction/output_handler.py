@@ -1,14 +1,10 @@
-from abc import ABC, abstractmethod
-
-
-class IOutputHandler(ABC):
-    @abstractmethod
+class IOutputHandler:
     def output_str(self, output: str) -> None:
         """
         Output a string.
         :param output: The string to output
         """
-        pass
+        raise NotImplementedError
 
 
 class ConsoleOutputHandler(IOutputHandler):
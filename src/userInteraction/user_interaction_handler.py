@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from contextlib import contextmanager
+from typing import Tuple, Iterator, List, Optional
 
 import src.userInteraction.input_handler as input_handler
 import src.userInteraction.output_handler as output_handler
@@ -30,6 +31,15 @@ class IUserInteractionHandler(ABC):
         """
         pass
 
+    @abstractmethod
+    def batched(self) -> Iterator["IUserInteractionHandler"]:
+        """
+        Context manager that collects all the messages displayed inside it and outputs them
+        together when it exits. Nested batches join the outermost one.
+        :return: A context manager for the batch (yields this handler).
+        """
+        pass
+
     @abstractmethod
     def get_input_or_exit(self, exit_input: str, input_msg: str = "") -> Tuple[bool, str]:
         """
@@ -51,13 +61,32 @@ class ConsoleInteractionHandler(IUserInteractionHandler):
     def __init__(self):
         self._input_handler = input_handler.ConsoleInputHandler()
         self._output_handler = output_handler.ConsoleOutputHandler()
+        self._batch: Optional[List[str]] = None  # messages waiting to be output, if currently batching
 
     def get_input(self, input_msg: str = "") -> str:
         self._output_handler.output_str(input_msg)
         return self._input_handler.get_input_str()
 
     def display(self, msg: str, end: str = "\n") -> None:
-        self._output_handler.output_str(msg + end)
+        if self._batch is not None:
+            self._batch.append(msg + end)
+        else:
+            self._output_handler.output_str(msg + end)
+
+    @contextmanager
+    def batched(self) -> Iterator["ConsoleInteractionHandler"]:
+        if self._batch is not None:
+            # already batching, the messages are output when the outer batch exits
+            yield self
+            return
+
+        self._batch = []
+
+        try:
+            yield self
+        finally:
+            batch, self._batch = self._batch, None
+            self._output_handler.output_str("".join(batch))
 
     def get_input_or_exit(self, exit_input: str, input_msg: str = "") -> Tuple[bool, str]:
         self._output_handler.output_str(input_msg)
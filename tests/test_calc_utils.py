@@ -5,17 +5,6 @@ from src.calculatorLogic import calc_utils
 
 class TestCalcUtils:
 
-    @pytest.mark.parametrize(
-        "string, new_string",
-        [
-            ("a b   c   de", "abcde"),
-            ("abc", "abc"),
-            ("abc bc  a", "abcbca")
-        ]
-    )
-    def test_delete_whitespace(self, string: str, new_string: str):
-        assert calc_utils.delete_whitespace(string) == new_string
-
     @pytest.mark.parametrize(
         "string, new_string",
         [
@@ -33,8 +22,14 @@ class TestCalcUtils:
             ("1", True),
             ("1.1", True),
             ("12.345", True),
-            ("1 2.34", True),
-            ("0. 34 1 ", True),
+            ("12.34", True),
+            (".341", True),
+            ("1.", True),
+            ("1 2.34", False),
+            ("0. 34 1 ", False),
+            ("1.2.3", False),
+            (".", False),
+            ("", False),
             ("=", False),
             ("34$", False),
             ("^16", False),
@@ -42,7 +37,10 @@ class TestCalcUtils:
             ("a", False),
             ("R", False),
             ("d23", False),
-            (";:", False)
+            (";:", False),
+            ("\u0663", True),
+            ("1\u0663.5", True),
+            ("\u00b2", False)
         ]
     )
     def test_is_float_str(self, string: str, result: bool):
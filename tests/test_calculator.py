@@ -1,9 +1,56 @@
+from typing import List
+
 import pytest
 
+from src import calculator
 from src.calculatorLogic.calc_errors import SolvingError, CalculationError, FormattingError
+from src.userInteraction import input_handler, output_handler
 from tests.constants_for_tests import test_calculator
 
 
+class ScriptedInputHandler(input_handler.IInputHandler):
+    def __init__(self, inputs: List[str]):
+        self._inputs = list(inputs)
+
+    def get_input_str(self) -> str:
+        if not self._inputs:
+            raise EOFError
+
+        return self._inputs.pop(0)
+
+
+class RecordingOutputHandler(output_handler.IOutputHandler):
+    def __init__(self):
+        self.outputs: List[str] = []
+
+    def output_str(self, output: str) -> None:
+        self.outputs.append(output)
+
+
+def run_calculator(inputs: List[str]):
+    """
+    Run a new calculator on the given inputs and count how many of them were actually solved.
+    :return: The calculator, everything it output and the number of solved expressions.
+    """
+    calc = calculator.Calculator()
+    recorder = RecordingOutputHandler()
+    calc.user_interaction_handler._input_handler = ScriptedInputHandler(inputs)
+    calc.user_interaction_handler._output_handler = recorder
+
+    solved_count = 0
+    try_solve_symbols = calc._try_solve_symbols
+
+    def counting_try_solve_symbols(symbol_list):
+        nonlocal solved_count
+        solved_count += 1
+        return try_solve_symbols(symbol_list)
+
+    calc._try_solve_symbols = counting_try_solve_symbols
+    calc.run()
+
+    return calc, "".join(recorder.outputs), solved_count
+
+
 class TestCalculator:
 
     @pytest.mark.parametrize(
@@ -75,7 +122,8 @@ class TestCalculator:
             ("12 - 12 + 12 * 12 / 12 ^ 2  + 12 % 12 + 111 - 10 / 2 * 3 - 1 ", 96),
             ("-(12 + 4) + 7 * 10 / 1 - 4 % 1 + 12 - 12 * 3 / 4 + 1", 58),
             ("~-7 + (3 * 4) / 2 - 10 + 15 - 2 + 1 * 2 ^ 3 / 2 + 11 - 2 * 3 + 4", 29),
-            ("15 +6 +9& 3 - 5^3 + 2*6 % 2 + (7*3- 1)", -81)
+            ("15 +6 +9& 3 - 5^3 + 2*6 % 2 + (7*3- 1)", -81),
+            ("\u0663+1", 4)
         ]
     )
     def test_calculate(self, expression: str, correct_answer: float):
@@ -118,4 +166,53 @@ class TestCalculator:
     )
     def test_calculate_raises(self, expression: str, expected_exception):
         with pytest.raises(expected_exception):
-            test_calculator.calculate(expression)
\ No newline at end of file
+            test_calculator.calculate(expression)
+
+    @pytest.mark.parametrize(
+        "expression, correct_answer",
+        [
+            ("1+2", 3),
+            ("-(2 + 3)", -5),
+            ("4! - 2! * 3", 18)
+        ]
+    )
+    def test_calculate_repeated(self, expression: str, correct_answer: float):
+        # the second call is answered from the formatting caches
+        assert test_calculator.calculate(expression) == correct_answer
+        assert test_calculator.calculate(expression) == correct_answer
+
+    @pytest.mark.parametrize(
+        "expression, expected_exception",
+        [
+            ("3^*2", FormattingError),
+            ("1 / 0", CalculationError),
+            ("", SolvingError)
+        ]
+    )
+    def test_calculate_repeated_raises(self, expression: str, expected_exception):
+        # failures are not cached, so they should be raised every time
+        for _ in range(2):
+            with pytest.raises(expected_exception):
+                test_calculator.calculate(expression)
+
+    def test_run_repeated_input_is_not_solved_again(self):
+        calc, output, solved_count = run_calculator(["1+2", "1+2", "1+2"])
+
+        assert solved_count == 1
+        assert output.count("= 3.0\n") == 3
+
+    def test_run_result_cache_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(calculator, "EXPR_CACHE_SIZE", 2)
+
+        # "1+1" is used again before "3+3" is added, so "2+2" is the one evicted (and solved again)
+        calc, output, solved_count = run_calculator(["1+1", "2+2", "1+1", "3+3", "2+2", "3+3"])
+
+        assert solved_count == 4  # the second "1+1" and "3+3" are answered from the cache
+        assert list(calc._expr_cache) == ["2+2", "3+3"]
+
+    def test_run_errors_are_not_cached(self):
+        calc, output, solved_count = run_calculator(["1/0", "1/0"])
+
+        assert solved_count == 2
+        assert output.count("Cannot divide by zero") == 2
+        assert "1/0" not in calc._expr_cache
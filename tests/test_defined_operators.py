@@ -0,0 +1,60 @@
+import pytest
+
+from src import calculator
+from src.calculatorLogic import defined_operators, operator
+from tests.constants_for_tests import def_ops
+
+
+class TestOmegaDefinedOperators:
+    def test_instances_copy_operators_dict(self):
+        other_ops = defined_operators.OmegaDefinedOperators()
+
+        assert other_ops.get_operators_dict() == def_ops.get_operators_dict()
+        assert other_ops.get_operators_dict() is not def_ops.get_operators_dict()
+
+    def test_subclass_keeps_own_operators(self):
+        class ExtendedDefinedOperators(defined_operators.OmegaDefinedOperators):
+            def _build_op_dict(self):
+                op_dict = super()._build_op_dict()
+                op_dict["?"] = op_dict["+"]
+                return op_dict
+
+        # the subclass is created first, its operators should not leak to the base class (and the other way)
+        extended_ops = ExtendedDefinedOperators()
+        other_ops = defined_operators.OmegaDefinedOperators()
+
+        assert "?" in extended_ops.get_operators_dict()
+        assert "?" not in other_ops.get_operators_dict()
+        assert "?" in ExtendedDefinedOperators().get_operators_dict()
+
+    def test_instances_do_not_share_overload_lists(self):
+        other_ops = defined_operators.OmegaDefinedOperators()
+
+        assert other_ops.get_operators_dict()["-"] is not def_ops.get_operators_dict()["-"]
+
+    def test_multiple_calculators(self):
+        # creating more instances should not change the operators of the existing ones
+        calculator.Calculator()
+        other_calculator = calculator.Calculator()
+
+        assert other_calculator.calculate("3 - -2 * 4!") == 51
+
+    def test_is_container(self):
+        for op_entry in def_ops.get_operators_dict().values():
+            for op in (op_entry if isinstance(op_entry, list) else [op_entry]):
+                assert op.is_container == isinstance(op, operator.ContainerOperator)
+
+    def test_is_unary_before(self):
+        for op_entry in def_ops.get_operators_dict().values():
+            for op in (op_entry if isinstance(op_entry, list) else [op_entry]):
+                assert op.is_unary_before == (isinstance(op, operator.UnaryOperator)
+                                              and op.get_operand_pos() == operator.UnaryOperator.OperandPos.BEFORE)
+
+    def test_operators_have_no_instance_dict(self):
+        for op_entry in def_ops.get_operators_dict().values():
+            for op in (op_entry if isinstance(op_entry, list) else [op_entry]):
+                assert not hasattr(op, "__dict__")
+
+    def test_operators_dict_is_read_only(self):
+        with pytest.raises(TypeError):
+            def_ops.get_operators_dict()["+"] = None
@@ -28,6 +28,9 @@ class TestPostfixFormatter:
             ("1+ 2*  5-   2 1", ["1", "+", "2", "*", "5", "-", "21"]),
             ("()))(", ["(", ")", ")", ")", "("]),
             ("2453 + gsddfv1&&   %23", ["2453", "+", "gsddfv1", "&", "&", "%", "23"]),
+            ("199\u066345", ["199\u066345"]),
+            ("\u0663+1", ["\u0663", "+", "1"]),
+            ("0\u00b27", ["0", "\u00b27"]),
         ]
     )
     def test_extract_symbols(self, expression: str, correct_expression: List[str]):
@@ -51,27 +54,27 @@ class TestPostfixFormatter:
             (["~", "7"], [7, ops["~"]]),
             (["5", "!"], [5, ops["!"]]),
             (["-", "3"], [3, minus]),
-            (["(", "5", "+", "4", ")"], [5, 4, ops["+"], ops["("]]),
-            (["(", "1.2", "+", "7.3", ")", "*", "0.8"], [1.2, 7.3, ops["+"], ops["("], 0.8, ops["*"]]),
-            (["(", "3", "+", "(", "8", "*", "2", ")", ")"], [3, 8, 2, ops["*"], ops["("], ops["+"], ops["("]]),
+            (["(", "5", "+", "4", ")"], [5, 4, ops["+"]]),
+            (["(", "1.2", "+", "7.3", ")", "*", "0.8"], [1.2, 7.3, ops["+"], 0.8, ops["*"]]),
+            (["(", "3", "+", "(", "8", "*", "2", ")", ")"], [3, 8, 2, ops["*"], ops["+"]]),
             (["(", "7", "+", "1", ")", "*", "(", "9", "-", "2", ")"],
-             [7, 1, ops["+"], ops["("], 9, 2, sub, ops["("], ops["*"]]),
-            (["(", "(", "4", "+", "5", ")", "*", "2", ")"], [4, 5, ops["+"], ops["("], 2, ops["*"], ops["("]]),
-            (["-", "(", "2.7", "+", "6", ")"], [2.7, 6, ops["+"], ops["("], minus]),
+             [7, 1, ops["+"], 9, 2, sub, ops["*"]]),
+            (["(", "(", "4", "+", "5", ")", "*", "2", ")"], [4, 5, ops["+"], 2, ops["*"]]),
+            (["-", "(", "2.7", "+", "6", ")"], [2.7, 6, ops["+"], minus]),
             (["3", "+", "-", "4"], [3, 4, sign, ops["+"]]),
             (["-", "9.4", "+", "2.21"], [9.4, minus, 2.21, ops["+"]]),
-            (["-", "(", "-", "5", ")"], [5, minus, ops["("], minus]),
+            (["-", "(", "-", "5", ")"], [5, minus, minus]),
             (["-", "-", "1"], [1, minus, minus]),
             (["8", "#"], [8, ops["#"]]),
             (["4", "+", "3", "#"], [4, 3, ops["#"], ops["+"]]),
             (["-", "6", "#"], [6, ops["#"], minus]),
             (["11", "+", "~", "2"], [11, 2, ops["~"], ops["+"]]),
             (["13", "!", "#"], [13, ops["!"], ops["#"]]),
-            (["(", "2", "+", "6", ")", "!", ], [2, 6, ops["+"], ops["("], ops["!"]]),
-            (["(", "5.8", "+", "3", "!", ")", ], [5.8, 3, ops["!"], ops["+"], ops["("]]),
+            (["(", "2", "+", "6", ")", "!", ], [2, 6, ops["+"], ops["!"]]),
+            (["(", "5.8", "+", "3", "!", ")", ], [5.8, 3, ops["!"], ops["+"]]),
             (["11", "$", "6", "&", "2", "@", "9"], [11, 6, ops["$"], 2, ops["&"], 9, ops["@"]]),
             (["(", "12", "$", "8", ")", "&", "(", "3", "@", "7", ")"],
-             [12, 8, ops["$"], ops["("], 3, 7, ops["@"], ops["("], ops["&"]])
+             [12, 8, ops["$"], 3, 7, ops["@"], ops["&"]])
         ]
     )
     def test_format_expression(self, expression: List[str], correct_expression: List[Any]):
@@ -108,9 +111,26 @@ class TestPostfixFormatter:
             ["@", "5.3"],
             ["-", "~", "-", "1"],
             ["~", "#"],
-            ["-", ")", "2.53"]
+            ["-", ")", "2.53"],
+            ["(", ")"],
+            ["(", ")", "4"],
+            ["2", "+", "(", ")"]
         ]
     )
     def test_format_expression_raises(self, expression: List[str]):
         with pytest.raises(calc_errors.FormattingError):
-            postfix_formatter.format_expression(expression)
\ No newline at end of file
+            postfix_formatter.format_expression(expression)
+
+    def test_format_expression_after_error(self):
+        # the formatter reuses its operator stacks, a failed expression leaves operators on them
+        with pytest.raises(calc_errors.FormattingError):
+            postfix_formatter.format_expression(["(", "3", "+"])
+
+        expression = ["3", "*", "(", "2", "-", "5", ")"]
+        assert postfix_formatter.format_expression(expression) == [3, 2, 5, sub, ops["*"]]
+
+    def test_format_expression_long_minus_chain(self):
+        assert postfix_formatter.format_expression(["-"] * 2000 + ["5"]) == [5] + [minus] * 2000
+
+        with pytest.raises(calc_errors.FormattingError):
+            postfix_formatter.format_expression(["~"] + ["-"] * 2000 + ["(", "5", ")"])
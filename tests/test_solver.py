@@ -74,9 +74,38 @@ class TestPostfixSolver:
             ([1.0, 3.0, ops['/'], ops['('], ops["#"]], calc_errors.CalculationError),
             ([1000.0, 10000.0, ops['^']], calc_errors.CalculationError),
             ([-1000.0, 10000.0, ops['^']], calc_errors.CalculationError),
-            ([234.534, 3.7, ops['~']], calc_errors.SolvingError)
+            ([234.534, 3.7, ops['~']], calc_errors.SolvingError),
+            ([ops['+'], 0.0, 0.0, ops['/']], calc_errors.SolvingError),
+            ([ops['!'], 1000.0, 10000.0, ops['^']], calc_errors.SolvingError)
         ]
     )
     def test_solve_raises(self, expression: List[Any], expected_exception):
         with pytest.raises(expected_exception):
-            postfix_solver.solve(expression)
\ No newline at end of file
+            postfix_solver.solve(expression)
+
+    @pytest.mark.parametrize(
+        "expression, correct_answer",
+        [
+            ([1.0, 2.0, ops["+"]], 3.0),
+            ([2.7, 6.0, ops["+"], ops["("], minus], -8.7),
+            ([13.0, ops["!"], ops["#"]], 27.0)
+        ]
+    )
+    def test_execute_compiled(self, expression: List[Any], correct_answer: float):
+        operands = postfix_solver.compile(expression)
+
+        # a compiled expression can be executed any number of times
+        assert postfix_solver.execute(operands) == correct_answer
+        assert postfix_solver.execute(operands) == correct_answer
+
+    def test_compile_calculates_operations(self):
+        # every operand is a known number, so the whole expression is calculated while compiling
+        assert postfix_solver.compile([4.0, 3.0, ops["^"], 6.0, ops["*"]]) == [384.0]
+
+        # the checks of the final result are left for execute()
+        assert postfix_solver.compile([1.0, 2.0]) == [1.0, 2.0]
+        assert postfix_solver.compile([]) == []
+
+        # missing operands are reported before any later operation is calculated
+        with pytest.raises(calc_errors.SolvingError):
+            postfix_solver.compile([1.0, ops["+"], 2.0, 0.0, ops["/"]])
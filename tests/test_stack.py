@@ -80,3 +80,17 @@ class TestListStack:
         num = s.top()
 
         assert char == 'a' and num == 1
+
+    def test_items(self):
+        s = ListStack()
+        items = s.items()
+
+        s.push(1)
+        s.push(2)
+        items.append(3)
+
+        assert items == [1, 2, 3] and s.top() == 3
+
+        s.empty()
+
+        assert s.items() is items and s.is_empty()
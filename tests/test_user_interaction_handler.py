@@ -0,0 +1,59 @@
+from typing import List
+
+from src.userInteraction import output_handler
+from src.userInteraction.user_interaction_handler import ConsoleInteractionHandler
+
+
+class RecordingOutputHandler(output_handler.IOutputHandler):
+    def __init__(self):
+        self.outputs: List[str] = []
+
+    def output_str(self, output: str) -> None:
+        self.outputs.append(output)
+
+
+class TestConsoleInteractionHandler:
+    def create_handler(self):
+        handler = ConsoleInteractionHandler()
+        recorder = RecordingOutputHandler()
+        handler._output_handler = recorder
+
+        return handler, recorder
+
+    def test_display(self):
+        handler, recorder = self.create_handler()
+
+        handler.display("1")
+        handler.display("2", end="")
+
+        assert recorder.outputs == ["1\n", "2"]
+
+    def test_batched(self):
+        handler, recorder = self.create_handler()
+
+        with handler.batched():
+            handler.display("first")
+            handler.display("second", end="")
+
+            assert recorder.outputs == []  # nothing is output before the batch exits
+
+        assert recorder.outputs == ["first\nsecond"]
+
+        # after the batch, messages are output right away again
+        handler.display("after")
+        assert recorder.outputs == ["first\nsecond", "after\n"]
+
+    def test_nested_batched(self):
+        handler, recorder = self.create_handler()
+
+        with handler.batched():
+            handler.display("outer-1")
+
+            with handler.batched():
+                handler.display("inner")
+
+            handler.display("outer-2")
+
+            assert recorder.outputs == []
+
+        assert recorder.outputs == ["outer-1\ninner\nouter-2\n"]